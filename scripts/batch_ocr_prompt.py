@@ -11,10 +11,18 @@ Dependencies:
 
 Optional (recommended):
     pip install opencv-python numpy tqdm
+    pip install tesserocr   # keeps one Tesseract instance loaded instead of a subprocess per image
 
 Make sure Tesseract OCR is installed and accessible (or supply its full path when prompted).
 """
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
 from pathlib import Path
+import os
+import re
+import shlex
 import sys
 import logging
 import textwrap
@@ -24,9 +32,14 @@ import pytesseract
 
 # Optional libraries
 try:
-    import cv2
     import numpy as np
-    HAVE_CV2 = True
+    HAVE_NUMPY = True
+except Exception:
+    HAVE_NUMPY = False
+
+try:
+    import cv2
+    HAVE_CV2 = HAVE_NUMPY
 except Exception:
     HAVE_CV2 = False
 
@@ -36,6 +49,32 @@ try:
 except Exception:
     HAVE_TQDM = False
 
+try:
+    import tesserocr
+    HAVE_TESSEROCR = True
+except Exception:
+    HAVE_TESSEROCR = False
+
+# Images preprocessed ahead of the one currently being OCR'd, shared between worker processes
+PREFETCH_DEPTH = 4
+# Images handed to a worker process at a time
+CHUNK_SIZE = 8
+
+# Longest side (px) of the downsampled copy used to estimate the deskew angle
+DESKEW_SAMPLE_SIZE = 1000
+
+# Pages wider than DEFAULT_MAX_WIDTH + MAX_WIDTH_TOLERANCE px are shrunk to the configured max width
+DEFAULT_MAX_WIDTH = 3000
+MAX_WIDTH_TOLERANCE = 500
+
+# Long-lived tesserocr instance for this process (None -> use pytesseract)
+_tess_api = None
+
+# This process's read-ahead depth and the preprocessing thread pool ocr_chunk
+# keeps across chunks (created on first use)
+_prefetch_depth = PREFETCH_DEPTH
+_pre_pool = None
+
 
 def prompt_with_default(prompt: str, default: str) -> str:
     prompt_full = f"{prompt} [{default}]: "
@@ -95,21 +134,67 @@ def upscale_image_pil(img: Image.Image, factor: int) -> Image.Image:
     if factor <= 1:
         return img
     w, h = img.size
+    if HAVE_CV2:
+        try:
+            arr = cv2.resize(np.asarray(img), (w * factor, h * factor), interpolation=cv2.INTER_CUBIC)
+            return Image.fromarray(arr)
+        except Exception as e:
+            logging.debug("OpenCV resize failed: %s", e)
     return img.resize((w * factor, h * factor), resample=Image.Resampling.LANCZOS)
 
 
-def pil_to_cv(img: Image.Image):
-    arr = np.array(img)
-    if arr.ndim == 2:
-        return arr
-    return cv2.cvtColor(arr, cv2.COLOR_RGB2BGR)
-
-
-def cv_to_pil(arr):
-    if arr.ndim == 2:
-        return Image.fromarray(arr)
-    arr_rgb = cv2.cvtColor(arr, cv2.COLOR_BGR2RGB)
-    return Image.fromarray(arr_rgb)
+def downscale_image_pil(img: Image.Image, max_width: int) -> Image.Image:
+    """Shrink pages well above max_width (Tesseract gains nothing past ~300 DPI and slows down)."""
+    if max_width <= 0 or img.width <= max_width + MAX_WIDTH_TOLERANCE:
+        return img
+    scale = max_width / img.width
+    size = (max_width, max(1, round(img.height * scale)))
+    if HAVE_CV2:
+        try:
+            return Image.fromarray(cv2.resize(np.asarray(img), size, interpolation=cv2.INTER_AREA))
+        except Exception as e:
+            logging.debug("OpenCV resize failed: %s", e)
+    return img.resize(size, resample=Image.Resampling.BOX)
+
+
+def _deskew_matrix(gray):
+    """Rotation matrix that deskews a 2-D uint8 page, or None if there is too little text."""
+    # The skew angle is scale-invariant, so estimate it on a reduced copy of large pages
+    sample = gray
+    longest = max(gray.shape)
+    if longest > DESKEW_SAMPLE_SIZE:
+        f = DESKEW_SAMPLE_SIZE / longest
+        sample = cv2.resize(gray, None, fx=f, fy=f, interpolation=cv2.INTER_AREA)
+    _, bw = cv2.threshold(sample, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    coords = cv2.findNonZero(cv2.bitwise_not(bw))
+    if coords is None or coords.shape[0] < 10:
+        logging.debug("Not enough text pixels for reliable deskew; skipping deskew.")
+        return None
+    # findNonZero yields (x, y); keep the (row, col) order the angle correction below expects
+    rect = cv2.minAreaRect(np.ascontiguousarray(coords.reshape(-1, 2)[:, ::-1]))
+    angle = rect[-1]
+    if angle < -45:
+        angle = -(90 + angle)
+    else:
+        angle = -angle
+    (h, w) = gray.shape
+    center = (w // 2, h // 2)
+    return cv2.getRotationMatrix2D(center, angle, 1.0)
+
+
+def _warp(arr, M):
+    h, w = arr.shape[:2]
+    return cv2.warpAffine(arr, M, (w, h), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
+
+
+def deskew_arr(gray):
+    """Deskew a 2-D uint8 grayscale array; returns it unchanged if deskew is not possible."""
+    try:
+        M = _deskew_matrix(gray)
+        return gray if M is None else _warp(gray, M)
+    except Exception as e:
+        logging.debug("Deskew failed: %s", e)
+        return gray
 
 
 def deskew_cv(img_pil: Image.Image) -> Image.Image:
@@ -117,47 +202,51 @@ def deskew_cv(img_pil: Image.Image) -> Image.Image:
         logging.debug("OpenCV not available; skipping deskew.")
         return img_pil
     try:
-        gray = pil_to_cv(img_pil if img_pil.mode == 'L' else img_pil.convert('L'))
-        _, bw = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        coords = np.column_stack(np.where(bw < 255))
-        if coords.shape[0] < 10:
-            logging.debug("Not enough text pixels for reliable deskew; skipping deskew.")
+        # warpAffine does not care about channel order, so rotate the PIL buffer as-is
+        src = np.asarray(img_pil)
+        gray = src if src.ndim == 2 else np.asarray(img_pil.convert('L'))
+        M = _deskew_matrix(gray)
+        if M is None:
             return img_pil
-        rect = cv2.minAreaRect(coords)
-        angle = rect[-1]
-        if angle < -45:
-            angle = -(90 + angle)
-        else:
-            angle = -angle
-        (h, w) = gray.shape
-        center = (w // 2, h // 2)
-        M = cv2.getRotationMatrix2D(center, angle, 1.0)
-        rotated = cv2.warpAffine(pil_to_cv(img_pil), M, (w, h),
-                                 flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
-        return cv_to_pil(rotated)
+        return Image.fromarray(_warp(src, M))
     except Exception as e:
         logging.debug("Deskew failed: %s", e)
         return img_pil
 
 
+def _threshold_fixed(gray):
+    return np.where(gray > 128, np.uint8(255), np.uint8(0))
+
+
+def threshold_arr(gray):
+    """Binarise a 2-D uint8 array with Otsu (fixed 128 cut-off if OpenCV fails)."""
+    try:
+        _, th = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        return th
+    except Exception as e:
+        logging.debug("OpenCV threshold failed: %s", e)
+        return _threshold_fixed(gray)
+
+
 def threshold_pil(img_pil: Image.Image) -> Image.Image:
     gray = img_pil.convert('L')
     if HAVE_CV2:
-        arr = np.array(gray)
-        try:
-            _, th = cv2.threshold(arr, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            return Image.fromarray(th)
-        except Exception as e:
-            logging.debug("OpenCV threshold failed: %s", e)
+        return Image.fromarray(threshold_arr(np.asarray(gray)))
+    if HAVE_NUMPY:
+        return Image.fromarray(_threshold_fixed(np.asarray(gray)))
     return gray.point(lambda p: 255 if p > 128 else 0) # type: ignore
 
 
-def preprocess_image(img_path: Path, method: str = 'thresh', upscale: int = 1) -> Image.Image:
+def preprocess_image(img_path: Path, method: str = 'thresh', upscale: int = 1,
+                     max_width: int = DEFAULT_MAX_WIDTH) -> Image.Image:
     img = Image.open(img_path)
     if img.mode not in ('L', 'RGB', 'RGBA'):
         img = img.convert('RGB')
     if upscale > 1:
         img = upscale_image_pil(img, upscale)
+    else:
+        # an explicit upscale request wins over the width cap
+        img = downscale_image_pil(img, max_width)
     if method == 'none':
         return img
     if method == 'thresh':
@@ -165,15 +254,37 @@ def preprocess_image(img_path: Path, method: str = 'thresh', upscale: int = 1) -
     if method == 'deskew':
         return deskew_cv(img)
     if method in ('thresh+deskew', 'deskew+thresh'):
-        d = deskew_cv(img)
-        return threshold_pil(d)
+        if HAVE_CV2:
+            # Thresholding discards colour anyway: convert once and keep the page as one gray array
+            gray = np.asarray(img.convert('L'))
+            return Image.fromarray(threshold_arr(deskew_arr(gray)))
+        return threshold_pil(deskew_cv(img))
     return img
 
 
+def _walk_images(root: Path, exts):
+    # scandir reuses the file type from the directory listing, so no extra stat per entry
+    dirs = [os.fspath(root)]
+    while dirs:
+        try:
+            it = os.scandir(dirs.pop())
+        except PermissionError:
+            # unreadable folder: skip its subtree, as Path.rglob does
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.path)
+                elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in exts:
+                    yield entry.path
+
+
 def gather_images(root: Path, extensions):
+    """Sorted list of image paths (as str) under root matching the given extensions."""
     exts = {e.lower() if e.startswith('.') else f'.{e.lower()}' for e in extensions}
-    files = [p for p in root.rglob('*') if p.is_file() and p.suffix.lower() in exts]
-    files.sort()
+    files = list(_walk_images(root, exts))
+    # Order as Path objects compare (part by part), not as raw strings: 'a/y' before 'a-b/x'
+    files.sort(key=Path)
     return files
 
 
@@ -229,6 +340,9 @@ def interactive_config():
     # Upscale
     upscale = prompt_int("Integer upscale factor (1 = none, 2 or 3 helpful for small scans)", 1, min_val=1, max_val=10)
 
+    # Downscale cap (ignored when upscaling)
+    max_width = prompt_int("Maximum page width in px before OCR (0 = never downscale)", DEFAULT_MAX_WIDTH, min_val=0)
+
     # Test-first mode
     test_first = prompt_yes_no("Test-first mode: only process the first image found?", default_yes=False)
 
@@ -265,8 +379,10 @@ def interactive_config():
         'config': config,
         'preprocess': preprocess,
         'upscale': upscale,
+        'max_width': max_width,
         'test_first': test_first,
-        'verbose': verbose
+        'verbose': verbose,
+        'tesseract_cmd': pytesseract.pytesseract.tesseract_cmd
     }
 
     print("\nConfiguration summary:")
@@ -279,6 +395,137 @@ def interactive_config():
     return summary
 
 
+def _parse_tess_config(config: str):
+    """
+    Translate a tesseract config string into PyTessBaseAPI keyword arguments and
+    -c variables. Returns None if it holds anything tesserocr can't be given, so
+    the caller keeps pytesseract rather than silently dropping options.
+    """
+    try:
+        tokens = shlex.split(config)
+    except ValueError:
+        return None
+    kwargs, variables = {}, []
+    i = 0
+    while i < len(tokens):
+        opt = tokens[i]
+        arg = tokens[i + 1] if i + 1 < len(tokens) else None
+        if opt in ('--psm', '--oem') and arg is not None and arg.isdigit():
+            kwargs[opt[2:]] = int(arg)
+        elif opt == '-c' and arg is not None and re.fullmatch(r'\w+=.*', arg):
+            variables.append(tuple(arg.split('=', 1)))
+        else:
+            return None
+        i += 2
+    return kwargs, variables
+
+
+def _init_tesserocr(cfg):
+    """Create this process's tesserocr instance; keeps pytesseract if unavailable."""
+    global _tess_api
+    if not HAVE_TESSEROCR or _tess_api is not None:
+        return
+    parsed = _parse_tess_config(cfg['config'])
+    if parsed is None:
+        logging.debug("Config %r has options tesserocr can't take; using pytesseract.", cfg['config'])
+        return
+    kwargs, variables = parsed
+    try:
+        # -c variables go in at Init, like on the command line, so init-only ones apply too
+        api = tesserocr.PyTessBaseAPI(lang=cfg['lang'], variables=dict(variables), **kwargs)
+    except Exception as e:
+        logging.debug("tesserocr unavailable (%s); falling back to pytesseract.", e)
+        return
+    unknown = [name for name, _ in variables if api.GetVariableAsString(name) is None]
+    if unknown:
+        logging.debug("tesserocr does not know variable(s) %s; using pytesseract.", ", ".join(unknown))
+        api.End()
+        return
+    _tess_api = api
+
+
+def _init_worker(cfg, workers=1):
+    global _prefetch_depth
+    # Spawned workers (Windows, macOS) don't inherit main()'s logging setup
+    logging.basicConfig(level=logging.DEBUG if cfg['verbose'] else logging.INFO,
+                        format='%(levelname)s: %(message)s')
+    # One tesseract and one OpenCV thread per worker process; parallelism comes from the pool.
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    if HAVE_CV2:
+        cv2.setNumThreads(1)
+    # The processes already fill every core: split the read-ahead between them,
+    # keeping at least one image in flight so preprocessing still overlaps OCR
+    _prefetch_depth = max(1, PREFETCH_DEPTH // workers)
+    pytesseract.pytesseract.tesseract_cmd = cfg['tesseract_cmd']
+    _init_tesserocr(cfg)
+
+
+def _ocr_image(img_path: str, cfg, load):
+    """
+    OCR one image and write its transcript. `load` returns the preprocessed image.
+    Returns (img_path, out_path, ok, err) where err is a message when ok is False.
+    """
+    img_path = Path(img_path)
+    try:
+        rel = img_path.relative_to(cfg['png_root'])
+    except Exception:
+        # fallback: use name only
+        rel = img_path.name
+    out_path = (cfg['out_root'] / rel).with_suffix('.txt')
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    logging.info("Processing: %s -> %s", img_path, out_path)
+    try:
+        pre = load()
+        if _tess_api is not None:
+            _tess_api.SetImage(pre)
+            text = _tess_api.GetUTF8Text()
+        else:
+            # pytesseract passes the image through a temp file in pre.format (PNG when unset);
+            # uncompressed PPM/PGM is far cheaper to write and read back than deflated PNG and,
+            # like the PNG, carries no resolution, so Tesseract still estimates the DPI itself
+            # (BMP would always claim 96 DPI)
+            pre.format = 'PPM'
+            text = pytesseract.image_to_string(pre, lang=cfg['lang'], config=cfg['config'])
+        out_path.write_text(text, encoding='utf-8')
+        return (img_path, out_path, True, None)
+    except UnidentifiedImageError:
+        return (img_path, out_path, False, f"File is not a recognized image: {img_path}")
+    except pytesseract.TesseractError as te:
+        return (img_path, out_path, False, f"Tesseract error processing {img_path}: {te}")
+    except Exception as e:
+        return (img_path, out_path, False, f"Failed to OCR {img_path}: {e}")
+
+
+def ocr_one(img_path: str, cfg):
+    """OCR a single image. See _ocr_image for the return value."""
+    return _ocr_image(img_path, cfg,
+                      lambda: preprocess_image(img_path, method=cfg['preprocess'], upscale=cfg['upscale'],
+                                               max_width=cfg['max_width']))
+
+
+def ocr_chunk(img_paths, cfg):
+    """
+    OCR a list of images in order, preprocessing up to _prefetch_depth images ahead
+    on this process's thread pool while tesseract works on the current one.
+    Returns a list of ocr_one-style result tuples.
+    """
+    global _pre_pool
+    if _pre_pool is None:
+        _pre_pool = ThreadPoolExecutor(max_workers=_prefetch_depth)
+    preprocess = partial(preprocess_image, method=cfg['preprocess'], upscale=cfg['upscale'],
+                         max_width=cfg['max_width'])
+    paths = iter(img_paths)
+    results = []
+    pending = deque((p, _pre_pool.submit(preprocess, p)) for p in islice(paths, _prefetch_depth))
+    while pending:
+        img_path, future = pending.popleft()
+        for nxt in islice(paths, 1):
+            pending.append((nxt, _pre_pool.submit(preprocess, nxt)))
+        results.append(_ocr_image(img_path, cfg, future.result))
+    return results
+
+
 def main():
     cfg = interactive_config()
     logging.basicConfig(level=logging.DEBUG if cfg['verbose'] else logging.INFO,
@@ -289,38 +536,31 @@ def main():
         logging.info("No images found under %s with extensions %s", cfg['png_root'], cfg['extensions'])
         return
 
-    iterable = images
-    if HAVE_TQDM and not cfg['test_first']:
-        iterable = tqdm(images, desc="OCR images", unit="img")
-
     processed = 0
-    for idx, img_path in enumerate(iterable):
-        if cfg['test_first'] and idx > 0:
-            break
-        try:
-            rel = img_path.relative_to(cfg['png_root'])
-        except Exception:
-            # fallback: use name only
-            rel = img_path.name
-        out_path = (cfg['out_root'] / rel).with_suffix('.txt')
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-
-        logging.info("Processing: %s -> %s", img_path, out_path)
-        try:
-            pre = preprocess_image(img_path, method=cfg['preprocess'], upscale=cfg['upscale'])
-            text = pytesseract.image_to_string(pre, lang=cfg['lang'], config=cfg['config'])
-            out_path.write_text(text, encoding='utf-8')
+    if cfg['test_first']:
+        _init_tesserocr(cfg)
+        _, _, ok, err = ocr_one(images[0], cfg)
+        if ok:
             processed += 1
-        except UnidentifiedImageError:
-            logging.error("File is not a recognized image: %s", img_path)
-        except pytesseract.TesseractError as te:
-            logging.error("Tesseract error processing %s: %s", img_path, te)
-        except Exception as e:
-            logging.error("Failed to OCR %s: %s", img_path, e)
-
-        if cfg['test_first']:
-            logging.info("Test-first mode: processed first image only.")
-            break
+        else:
+            logging.error(err)
+        logging.info("Test-first mode: processed first image only.")
+    else:
+        progress = tqdm(total=len(images), desc="OCR images", unit="img") if HAVE_TQDM else None
+        chunks = [images[i:i + CHUNK_SIZE] for i in range(0, len(images), CHUNK_SIZE)]
+        workers = os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(cfg, workers)) as executor:
+            for results in executor.map(partial(ocr_chunk, cfg=cfg), chunks):
+                for _, _, ok, err in results:
+                    if ok:
+                        processed += 1
+                    else:
+                        logging.error(err)
+                if progress is not None:
+                    progress.update(len(results))
+        if progress is not None:
+            progress.close()
 
     logging.info("Done. Processed %d image(s). Transcripts are under: %s", processed, cfg['out_root'])
 
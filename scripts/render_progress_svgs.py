@@ -1,10 +1,16 @@
+import bisect
+import functools
 import math
 import os
 import sys
-from typing import Any, List, Dict, Optional
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, List, Dict, Optional
 import xml.sax.saxutils as sax
 import yaml
 
+# libyaml-backed loader when PyYAML was built with it, pure-Python SafeLoader otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 # =========================
 # Global Error & Warning Handler
@@ -30,6 +36,48 @@ def handle_warning(message: str) -> None:
     warning_messages.append(message)
 
 
+# =========================
+# Section Model
+# =========================
+
+@dataclass(slots=True)
+class Subgroup:
+    """A leaf of a group: a tracked set of units."""
+    id: Any
+    label: str
+    total: int
+    units: Dict[str, Any]
+
+    # subgroups never nest further
+    subgroups: ClassVar[tuple] = ()
+
+
+@dataclass(slots=True)
+class Group:
+    """
+    A group of a section. Either it holds 'subgroups', or (with no subgroups)
+    it is a leaf itself and carries 'total' and 'units' directly.
+    """
+    id: Any
+    label: str
+    total: int = 0
+    units: Optional[Dict[str, Any]] = None
+    subgroups: List[Subgroup] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Section:
+    """One entry of progress.yaml's 'sections', rendered to progress/<id>.svg."""
+    id: Any
+    title: str
+    unit: Dict[str, str]
+    states: Dict[int, str]
+    final_state: Optional[int]
+    groups: List[Group]
+    # top-level units of sections without groups; None when the YAML has none
+    units: Optional[Dict[str, Any]] = None
+
+
 # =========================
 # SVG Rendering Logic
 # =========================
@@ -77,112 +125,202 @@ def interpolate_color(colors, value):
             return rgb_to_hex((r, g, b))
 
 
+# Gradient for state colors (Github contribution graph gradient)
+STATE_GRADIENT = [
+    (0.00, "#161c23"),
+    (0.25, "#0e4527"),
+    (0.50, "#006e34"),
+    (0.75, "#28a541"),
+    (1.00, "#39d255"),
+]
+
+# STATE_GRADIENT sorted by position with colors pre-parsed to (r, g, b)
+_STATE_GRADIENT_SORTED = sorted(STATE_GRADIENT, key=lambda x: x[0])
+_STATE_GRADIENT_RGB = [(p, hex_to_rgb(c)) for p, c in _STATE_GRADIENT_SORTED]
+
+
+@functools.lru_cache(maxsize=256)
+def state_color(value):
+    """
+    Same as interpolate_color(STATE_GRADIENT, value), without re-sorting and
+    re-parsing the gradient on every call. Results are cached per value.
+    """
+    if not 0 <= value <= 1:
+        raise ValueError("Value must be between 0 and 1")
+
+    # Clamp to endpoints
+    if value <= _STATE_GRADIENT_SORTED[0][0]:
+        return _STATE_GRADIENT_SORTED[0][1]
+    if value >= _STATE_GRADIENT_SORTED[-1][0]:
+        return _STATE_GRADIENT_SORTED[-1][1]
+
+    colors = _STATE_GRADIENT_RGB
+    for (p1, (r1, g1, b1)), (p2, (r2, g2, b2)) in zip(colors, colors[1:]):
+        if p1 <= value <= p2:
+            t = (value - p1) / (p2 - p1)
+            return rgb_to_hex((round(r1 + (r2 - r1) * t), round(g1 + (g2 - g1) * t), round(b1 + (b2 - b1) * t)))
+
+
 def compute_state_counters(section):
     """
     Compute counters for each state (except 0).
     A unit at state N counts as completed for all states < N.
     Returns dict: state -> (completed, total)
     """
-    states = section.get("states", {})
+    states = section.states
     # collect unit values from all groups recursively
     unit_states = []
     total_units = 0
 
-    def collect_units(node):
-        nonlocal total_units
-        if not node:
-            return
-        if isinstance(node, dict):
-            if "units" in node:
-                for _, val in node["units"].items():
-                    unit_states.append(int(val))
-                    total_units += 1
-            for sub in node.get("subgroups", []):
-                collect_units(sub)
-
-    for grp in section.get("groups", []):
-        collect_units(grp)
+    # walk groups and their subgroups with an explicit stack (order is irrelevant here)
+    stack = list(section.groups)
+    while stack:
+        node = stack.pop()
+        if node.units is not None:
+            for _, val in node.units.items():
+                unit_states.append(int(val))
+                total_units += 1
+        stack.extend(node.subgroups)
 
     counters = {}
     # states keys might be ints or strings; normalize them to ints
     state_keys = sorted([int(k) for k in states.keys()])
+    # with sorted unit states, the units at or above s are everything right of its insertion point
+    unit_states.sort()
     for s in state_keys:
         if s == 0:
             continue
-        completed = sum(1 for v in unit_states if v >= s)
+        completed = total_units - bisect.bisect_left(unit_states, s)
         counters[s] = (completed, total_units)
     return counters, total_units
 
 
+def _svg_text(raw):
+    # TEXT|x|y|class|content — only the free-text content can need escaping
+    parts = raw.split("|", 4)
+    if len(parts) < 5:
+        raise ValueError("TEXT command requires 4 arguments: x, y, class, content")
+    _, x, y, cls, content = parts
+    return f'<text x="{x}" y="{y}" class="{cls}">{sax.escape(content)}</text>'
+
+
+def _svg_rect(raw):
+    # RECT|x|y|width|height|rx|ry|class|fill(optional)
+    rect_parts = raw.split("|", 8)
+    if len(rect_parts) < 8:
+        raise ValueError("RECT command requires 7 arguments: x,y,width,height,rx,ry,class")
+    _, x, y, w, h, rx, ry, cls = rect_parts[:8]
+    fill_attr = f' fill="{sax.escape(rect_parts[8])}"' if len(rect_parts) > 8 and rect_parts[8] else ""
+    return f'<rect x="{x}" y="{y}" width="{w}" height="{h}" rx="{rx}" ry="{ry}" class="{cls}"{fill_attr} />'
+
+
+def _svg_group_open(raw):
+    # GROUP_OPEN|id|transform(optional)
+    parts = raw.split("|", 4)
+    gid = parts[1] if len(parts) > 1 else ""
+    transform = parts[2] if len(parts) > 2 else ""
+    transform_attr = f' transform="{sax.escape(transform)}"' if transform else ""
+    return f'<g id="{sax.escape(gid)}"{transform_attr}>'
+
+
+def _svg_group_close(raw):
+    return "</g>"
+
+
+def _svg_raw(raw):
+    # RAW|<svg fragment> — already rendered, emitted as-is
+    return raw.split("|", 1)[1]
+
+
+# Command name -> handler returning the SVG fragment for that command
+SVG_COMMAND_HANDLERS = {
+    "TEXT": _svg_text,
+    "RECT": _svg_rect,
+    "GROUP_OPEN": _svg_group_open,
+    "GROUP_CLOSE": _svg_group_close,
+    "RAW": _svg_raw,
+}
+
+
+def _safe_int(value, default=0):
+    """
+    int(value), or default if it cannot be converted. Plain ints and plain
+    decimal strings (what YAML keys and values usually are) skip the try/except.
+    """
+    if type(value) is int:
+        return value
+    if type(value) is str and (value.isdecimal() or (value[:1] == "-" and value[1:].isdecimal())):
+        return int(value)
+    try:
+        return int(value)
+    except Exception:
+        return default
+
+
+# Output buffer for SVG files, large enough that a typical SVG goes out in one write
+SVG_WRITE_BUFFER_SIZE = 1 << 20
+
+
 def generate_svg_from_lines(lines, out_path, svg_width, svg_height):
     """
     Interpret a list of command strings and write an SVG file.
 
-    Commands supported (simple, extensible):
+    Commands supported (simple, extensible via SVG_COMMAND_HANDLERS):
       - STYLE|<css-text>
       - TEXT|x|y|class|content
-      - RECT|x|y|width|height|rx|ry|class
+      - RECT|x|y|width|height|rx|ry|class|fill(optional)
       - GROUP_OPEN|id|transform(optional)
       - GROUP_CLOSE
+      - RAW|<svg fragment>
     Any unknown command is emitted verbatim as an SVG fragment.
     """
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
 
     style_blocks = []
-    body_elements = []
+    body = bytearray()
 
     for raw in lines:
         if not raw or not isinstance(raw, str):
             continue
 
-        # split into up to 5 parts to keep content as a single piece
-        parts = raw.split("|", 4)
+        # Fast paths for the canonical spelling of the bulk commands: no split/strip/upper
+        if raw.startswith("RAW|"):
+            frag = _svg_raw(raw)
+        elif raw.startswith("RECT|"):
+            frag = _svg_rect(raw)
+        elif raw.startswith("TEXT|"):
+            frag = _svg_text(raw)
+        else:
+            frag = None
+        if frag is not None:
+            body += frag.encode("utf-8")
+            body += b"\n"
+            continue
 
-        cmd = parts[0].strip().upper()
+        cmd = raw.split("|", 1)[0].strip().upper()
 
         if cmd == "STYLE":
-            # whole CSS in parts[1] (or join remainder)
-            css = parts[1] if len(parts) > 1 else ""
-            style_blocks.append(css)
-        elif cmd == "TEXT":
-            # TEXT|x|y|class|content
-            if len(parts) < 5:
-                raise ValueError("TEXT command requires 4 arguments: x, y, class, content")
-            _, x, y, cls, content = parts
-            body_elements.append(f'<text x="{x}" y="{y}" class="{cls}">{sax.escape(content)}</text>')
-        elif cmd == "RECT":
-            # RECT|x|y|width|height|rx|ry|class  (we use split with max 8 fields if needed)
-            rect_parts = raw.split("|", 8)
-            if len(rect_parts) < 8:
-                raise ValueError("RECT command requires 7 arguments: x,y,width,height,rx,ry,class")
-            _, x, y, w, h, rx, ry, cls = rect_parts[:8]
-            body_elements.append(f'<rect x="{x}" y="{y}" width="{w}" height="{h}" rx="{rx}" ry="{ry}" class="{cls}" />')
-        elif cmd == "GROUP_OPEN":
-            # GROUP_OPEN|id|transform(optional)
-            gid = parts[1] if len(parts) > 1 else ""
-            transform = parts[2] if len(parts) > 2 else ""
-            transform_attr = f' transform="{sax.escape(transform)}"' if transform else ""
-            body_elements.append(f'<g id="{sax.escape(gid)}"{transform_attr}>')
-        elif cmd == "GROUP_CLOSE":
-            body_elements.append("</g>")
-        else:
-            # Unknown command: treat as raw svg fragment
-            body_elements.append(raw)
-
-    # Assemble final SVG
-    svg_lines = []
-    svg_lines.append(f'<svg xmlns="http://www.w3.org/2000/svg" width="{svg_width}" viewBox="0 0 {svg_width} {svg_height}">')
-    if style_blocks:
-        svg_lines.append("<style>")
-        for css in style_blocks:
-            svg_lines.append(css)
-        svg_lines.append("</style>")
-    svg_lines.extend(body_elements)
-    svg_lines.append("</svg>")
-
-    svg_content = "\n".join(svg_lines)
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write(svg_content)
+            # whole CSS in the second field
+            parts = raw.split("|", 4)
+            style_blocks.append(parts[1] if len(parts) > 1 else "")
+            continue
+
+        handler = SVG_COMMAND_HANDLERS.get(cmd)
+        # Unknown command: treat as raw svg fragment
+        body += (handler(raw) if handler else raw).encode("utf-8")
+        body += b"\n"
+
+    # Write the SVG piece by piece; the body buffer is handed over without another copy
+    with open(out_path, "wb", buffering=SVG_WRITE_BUFFER_SIZE) as f:
+        f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{svg_width}" viewBox="0 0 {svg_width} {svg_height}">\n'.encode("utf-8"))
+        if style_blocks:
+            f.write(b"<style>\n")
+            for css in style_blocks:
+                f.write(css.encode("utf-8"))
+                f.write(b"\n")
+            f.write(b"</style>\n")
+        f.write(body)
+        f.write(b"</svg>")
 
     print(f"Wrote SVG to {out_path} (width {svg_width}, height {svg_height})")
 
@@ -197,13 +335,14 @@ def generate_grid_commands(
     rx=2,
     ry=2,
     show_unit_ids=False,
-    unit_order=None
+    unit_order=None,
+    state_fills=None
 ):
     """
     Generate commands that draw a simple grid of square cells for the given group.
 
     Parameters:
-      - group: dict containing 'units' (mapping unit_id -> integer state) and optionally 'total'
+      - group: Group or Subgroup whose 'units' maps unit_id -> integer state
       - origin_x, origin_y: top-left coordinates where grid begins
       - cols: desired number of columns (will be clamped based on item count)
       - cell_size: side length of each square cell (px)
@@ -212,23 +351,25 @@ def generate_grid_commands(
       - show_unit_ids: if True adds a small TEXT label per cell with the unit id (for debugging)
       - unit_order: optional list to force ordering of unit ids (fallback: sorted keys)
       - unit_id_pattern: optional regex string (not validated here) — kept for compatibility
+      - state_fills: optional mapping state -> fill color, emitted as each cell's fill attribute
 
     Returns:
       - (commands_list, total_height)
-        commands_list: list of command strings (RECT and optional TEXT)
+        commands_list: list of command strings (a RAW fragment holding the cells, wrapped in a group)
         total_height: vertical space consumed by the grid (including gaps) — caller must add margin as needed.
 
     Notes:
-      - Each cell RECT uses class "square state-{N}" where N is the unit's integer state (0..max_state).
+      - Each cell rect uses class "square state-{N}" where N is the unit's integer state (0..max_state).
+      - Each cell rect gets fill="state_fills[N]", or fill="none" for states without a color.
       - If a unit is missing or its value is not an int, it's treated as 0.
-      - The function does not attempt to compute or validate colors/styles.
+      - The function does not compute colors itself.
     """
     # Label positioning for unit IDs (when debugging)
     LABEL_OFFSET_BELOW_CELL = 10
 
     cmds = []
-    units_map = group.get("units", {}) or {}
-    group_id = group.get("id", "group")
+    units_map = group.units or {}
+    group_id = group.id
 
     # Determine number of cells
     if units_map:
@@ -236,7 +377,7 @@ def generate_grid_commands(
         n_cells = len(unit_ids)
     else:
         # fallback: use group's declared total if no units listed
-        n_cells = group.get("total", 0) or 0
+        n_cells = group.total or 0
         # create placeholder IDs so cells are drawn (but states default to 0)
         unit_ids = [f"{group_id}-{i+1:03d}" for i in range(n_cells)]
 
@@ -248,35 +389,43 @@ def generate_grid_commands(
     cols = max(1, min(int(cols), n_cells))
     rows = math.ceil(n_cells / cols)
 
-    # For each cell compute coordinates and emit RECT with class based on state
+    # Per-cell state values
+    if units_map:
+        states = [_safe_int(units_map.get(uid, 0)) for uid in unit_ids]
+    else:
+        # placeholder IDs never appear in units_map
+        states = [0] * n_cells
+
+    # For each cell compute coordinates and render a rect with class based on state
     x0 = origin_x
     y0 = origin_y
+    step = cell_size + gap
 
     # Open group wrapper
     cmds.append('GROUP_OPEN|grid|')
 
-    # iterate and emit
-    idx = 0
-    for r in range(rows):
-        for c in range(cols):
-            if idx >= n_cells:
-                break
-            uid = unit_ids[idx]
-            # get state value
-            try:
-                state_val = int(units_map.get(uid, 0))
-            except Exception:
-                state_val = 0
-            cell_x = x0 + c * (cell_size + gap)
-            cell_y = y0 + r * (cell_size + gap)
-            # Emit rect command: RECT|x|y|w|h|rx|ry|class
-            cmds.append(f'RECT|{cell_x}|{cell_y}|{cell_size}|{cell_size}|{rx}|{ry}|square state-{state_val}')
-            if show_unit_ids:
-                # small unit id labels centered below cell (debugging)
-                label_x = cell_x + (cell_size / 2)
-                label_y = cell_y + cell_size + LABEL_OFFSET_BELOW_CELL
-                cmds.append(f'TEXT|{label_x}|{label_y}|body|{uid}')
-            idx += 1
+    # The whole grid is rendered here and passed on as a single RAW fragment
+    state_fills = state_fills or {}
+    rect_tmpl = '<rect x="%s" y="%s" width="%s" height="%s" rx="%s" ry="%s" class="square state-%s" fill="%s" />'
+    if not show_unit_ids:
+        cells = "\n".join(
+            rect_tmpl % (x0 + (i % cols) * step, y0 + (i // cols) * step, cell_size, cell_size, rx, ry,
+                         state_val, state_fills.get(state_val, "none"))
+            for i, state_val in enumerate(states)
+        )
+    else:
+        # small unit id labels centered below cell (debugging)
+        fragments = []
+        for i, (uid, state_val) in enumerate(zip(unit_ids, states)):
+            cell_x = x0 + (i % cols) * step
+            cell_y = y0 + (i // cols) * step
+            fragments.append(rect_tmpl % (cell_x, cell_y, cell_size, cell_size, rx, ry,
+                                          state_val, state_fills.get(state_val, "none")))
+            label_x = cell_x + (cell_size / 2)
+            label_y = cell_y + cell_size + LABEL_OFFSET_BELOW_CELL
+            fragments.append(f'<text x="{label_x}" y="{label_y}" class="body">{sax.escape(str(uid))}</text>')
+        cells = "\n".join(fragments)
+    cmds.append("RAW|" + cells)
 
     # Close group wrapper
     cmds.append('GROUP_CLOSE|')
@@ -319,17 +468,9 @@ def render_section_svg(
     LEGEND_TEXT_OFFSET = 8
     # Spacing after uncatalogued warning
     UNCATALOGUED_SPACING = 30
-    # Gradient for state colors (Github contribution graph gradient)
-    GRADIENT = [
-        (0.00, "#161c23"),
-        (0.25, "#0e4527"),
-        (0.50, "#006e34"),
-        (0.75, "#28a541"),
-        (1.00, "#39d255"),
-    ]
 
     # Normalise state keys
-    states = section.get("states", {})
+    states = section.states
     state_keys = sorted([int(k) for k in states.keys()])
 
     # Cursor
@@ -368,7 +509,7 @@ def render_section_svg(
     # Prepare command lines list
     cmds = []
 
-    # Centralised CSS (class definitions left intentionally unfilled for per-state colors)
+    # Centralised CSS (per-state colors are set as fill attributes, see state_fills)
     css_lines = [
         '* { font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", "Noto Sans", Helvetica, Arial, sans-serif, "Apple Color Emoji", "Segoe UI Emoji"; }',
         '.bg { fill: #0d1116; rx: 10px; ry: 10px; }',
@@ -376,42 +517,48 @@ def render_section_svg(
         '.path { font: 16px sans-serif; fill: #fff; }',
         '.legend { font: 16px sans-serif; fill: #fff; }',
         '.body { font: 16px sans-serif; fill: #fff; }',
-        '.square { rx: 2px; fill: none; }',
+        '.square { rx: 2px; }',
     ]
+
+    # Resolve each state's color once; grid cells and legend squares carry it directly
+    state_fills = {}
     for i, s in enumerate(state_keys):
         percent = i / (len(state_keys) - 1) if len(state_keys) > 1 else 0.5
-        css_lines.append(f'.square.state-{s} {{ fill: {interpolate_color(GRADIENT, percent)}; }}')
+        state_fills[s] = state_color(percent)
 
     cmds.append("STYLE|" + "\n".join(css_lines))
 
     # Title
     if show_title:
-        cmds.append(f'TEXT|{x}|{y+TEXT_BASELINE_OFFSET}|title|{section.get("title","Section")}')
+        cmds.append(f'TEXT|{x}|{y+TEXT_BASELINE_OFFSET}|title|{section.title}')
         y += title_gap
 
     # helper: append_text and append_rect via commands
     def append_text_at(text, xpos, ypos, cls="path"):
         cmds.append(f'TEXT|{xpos}|{ypos+TEXT_BASELINE_OFFSET}|{cls}|{text}')
 
-    def render_group(group, path):
+    def render_group(root_group):
+        """Render a group and its subgroups depth-first, in document order."""
         nonlocal y
-        current_path = path + [group.get("label", group.get("id", ""))]
-        # Leaf groups: have units
-        if "units" in group and group["units"] is not None:
-            header = "/".join(current_path)
-            append_text_at(header, x, y, "path")
-            y += path_gap  # spacing under header
-            if group.get("total", 0) == 0:
-                handle_warning(f"Group '{header}' has total=0; considered uncatalogued.")
-                append_text_at("Units have not yet been catalogued for tracking progress.", x, y, "body")
-                y += UNCATALOGUED_SPACING
-                return
-
-            render_grid_section(group)
-
-        # Recurse into subgroups
-        for sub in group.get("subgroups", []):
-            render_group(sub, current_path)
+        stack = [(root_group, [])]
+        while stack:
+            group, path = stack.pop()
+            current_path = path + [group.label]
+            # Leaf groups: have units
+            if group.units is not None:
+                header = "/".join(current_path)
+                append_text_at(header, x, y, "path")
+                y += path_gap  # spacing under header
+                if group.total == 0:
+                    handle_warning(f"Group '{header}' has total=0; considered uncatalogued.")
+                    append_text_at("Units have not yet been catalogued for tracking progress.", x, y, "body")
+                    y += UNCATALOGUED_SPACING
+                    continue
+
+                render_grid_section(group)
+
+            # Descend into subgroups; pushed reversed so the first subgroup is rendered first
+            stack.extend((sub, current_path) for sub in reversed(group.subgroups))
 
     def render_grid_section(group):
         """Render a grid for the given group and advance y cursor."""
@@ -426,25 +573,26 @@ def render_section_svg(
             rx=grid_rx,
             ry=grid_ry,
             show_unit_ids=False,
+            state_fills=state_fills,
         )
         cmds.extend(grid_cmds)
         y += grid_height + GRID_POST_SPACING
 
     # Handle ungrouped sections
-    if not section.get("groups"):
-        units_map = section.get("units", {})
+    if not section.groups:
+        units_map = section.units or {}
         if len(units_map) == 0:
-            handle_warning(f"Section '{section.get('title','')}' has no units; considered uncatalogued.")
+            handle_warning(f"Section '{section.title}' has no units; considered uncatalogued.")
             append_text_at('Units have not yet been catalogued for tracking progress.', x, y, "body")
             y += UNCATALOGUED_SPACING
         else:
             # build a synthetic group for top-level units
-            synthetic_group = {"id": "all", "label": "All", "units": units_map}
+            synthetic_group = Group(id="all", label="All", units=units_map)
             render_grid_section(synthetic_group)
     else:
         # Render subgroups; top-level headers are omitted when they have subgroups (path-style used in leaves)
-        for grp in section.get("groups", []):
-            render_group(grp, [])
+        for grp in section.groups:
+            render_group(grp)
 
     # Legend: compute counters
     counters, total_units = compute_state_counters(section=section)
@@ -459,14 +607,14 @@ def render_section_svg(
         sq_y = legend_y
         sq_size = legend_square_size
         # square rect in legend
-        cmds.append(f'RECT|{sq_x}|{sq_y-LEGEND_SQUARE_BASELINE_OFFSET}|{sq_size}|{sq_size}|2|2|square state-{s}')
+        cmds.append(f'RECT|{sq_x}|{sq_y-LEGEND_SQUARE_BASELINE_OFFSET}|{sq_size}|{sq_size}|2|2|square state-{s}|{state_fills[s]}')
         # label and optional counters
         if s == 0:
             text = f'{label}'
         else:
             completed, total = counters.get(s, (0, total_units))
             pct = (completed / total * 100) if total else 0.0
-            unit_plural = section.get("unit", {}).get("plural", "units")
+            unit_plural = section.unit.get("plural", "units")
             text = f'{label} ({completed}/{total} {unit_plural}, {pct:.1f}%)'
         cmds.append(f'TEXT|{sq_x + sq_size + LEGEND_TEXT_OFFSET}|{sq_y}|legend|{text}')
         legend_y += legend_spacing
@@ -483,7 +631,7 @@ def render_section_svg(
 # Interpretation Logic
 # =========================
 
-def interpret_sections(progress: Any) -> Optional[List[Dict[str, Any]]]:
+def interpret_sections(progress: Any) -> Optional[List[Section]]:
     """
     Interpret the 'sections' format from progress.yaml.
 
@@ -492,7 +640,7 @@ def interpret_sections(progress: Any) -> Optional[List[Dict[str, Any]]]:
       - groups that instead carry 'total' and 'units' directly (treated as a single subgroup)
       - sections that have top-level 'units' and no 'groups' (treated as section-level units)
 
-    Returns a list of section dictionaries or None on fatal input problems.
+    Returns a list of Section objects or None on fatal input problems.
     Non-fatal issues are recorded via handle_error and processing continues where possible.
     """
     if not isinstance(progress, dict):
@@ -508,7 +656,7 @@ def interpret_sections(progress: Any) -> Optional[List[Dict[str, Any]]]:
         handle_error("'sections' must be a mapping/dictionary.")
         return None
 
-    sections_out: List[Dict[str, Any]] = []
+    sections_out: List[Section] = []
 
     for section_key, sec in sections_raw.items():
         if not isinstance(sec, dict):
@@ -540,9 +688,8 @@ def interpret_sections(progress: Any) -> Optional[List[Dict[str, Any]]]:
         if isinstance(states, dict):
             for k, v in states.items():
                 # allow keys that are int or strings representing ints
-                try:
-                    key_int = int(k) if not isinstance(k, int) else k
-                except Exception:
+                key_int = _safe_int(k, None)
+                if key_int is None:
                     handle_error(f"Section '{section_key}': state key '{k}' is not an integer; skipping.")
                     continue
                 if not isinstance(v, str):
@@ -555,14 +702,12 @@ def interpret_sections(progress: Any) -> Optional[List[Dict[str, Any]]]:
 
         # Validate final_state
         if final_state is not None:
-            try:
-                final_state = int(final_state)
-            except Exception:
+            final_state = _safe_int(final_state, None)
+            if final_state is None:
                 handle_error(f"Section '{section_key}': 'final_state' must be an integer. Setting to None.")
-                final_state = None
 
         # Process groups (if present). Some sections may instead use top-level 'units'.
-        groups_out: List[Dict[str, Any]] = []
+        groups_out: List[Group] = []
 
         if groups is None:
             # No groups provided. If section-level units exist, keep them in output.
@@ -599,7 +744,7 @@ def interpret_sections(progress: Any) -> Optional[List[Dict[str, Any]]]:
                         handle_error(f"Section '{section_key}', group '{gid}': 'subgroups' must be a list.")
                         g_subgroups = []
 
-                    subgroups_out: List[Dict[str, Any]] = []
+                    subgroups_out: List[Subgroup] = []
                     for si, sg in enumerate(g_subgroups):
                         if not isinstance(sg, dict):
                             handle_error(f"Section '{section_key}', group '{gid}': subgroup at index {si} invalid; skipping.")
@@ -619,9 +764,8 @@ def interpret_sections(progress: Any) -> Optional[List[Dict[str, Any]]]:
                             handle_warning(f"Section '{section_key}', group '{gid}', subgroup '{sid}': missing 'total'. Setting to 0.")
                             total = 0
                         else:
-                            try:
-                                total = int(total)
-                            except Exception:
+                            total = _safe_int(total, None)
+                            if total is None:
                                 handle_error(f"Section '{section_key}', group '{gid}', subgroup '{sid}': 'total' not an integer; setting to 0.")
                                 total = 0
 
@@ -629,18 +773,9 @@ def interpret_sections(progress: Any) -> Optional[List[Dict[str, Any]]]:
                             handle_error(f"Section '{section_key}', group '{gid}', subgroup '{sid}': 'units' must be a mapping; using empty dict.")
                             units = {}
 
-                        subgroups_out.append({
-                            "id": sid,
-                            "label": slabel,
-                            "total": total,
-                            "units": units
-                        })
-
-                    groups_out.append({
-                        "id": gid,
-                        "label": glabel,
-                        "subgroups": subgroups_out
-                    })
+                        subgroups_out.append(Subgroup(sid, slabel, total, units))
+
+                    groups_out.append(Group(gid, glabel, subgroups=subgroups_out))
                 else:
                     # Case B: group does NOT have 'subgroups' — treat group itself as a single subgroup
                     # Accept group-level 'total' and 'units' or default them
@@ -649,9 +784,8 @@ def interpret_sections(progress: Any) -> Optional[List[Dict[str, Any]]]:
                         handle_warning(f"Section '{section_key}', group '{gid}': missing 'total'. Setting to 0.")
                         g_total_val = 0
                     else:
-                        try:
-                            g_total_val = int(g_total)
-                        except Exception:
+                        g_total_val = _safe_int(g_total, None)
+                        if g_total_val is None:
                             handle_error(f"Section '{section_key}', group '{gid}': 'total' not an integer; setting to 0.")
                             g_total_val = 0
 
@@ -663,27 +797,22 @@ def interpret_sections(progress: Any) -> Optional[List[Dict[str, Any]]]:
                     else:
                         g_units_val = g_units
 
-                    groups_out.append({
-                        "id": gid,
-                        "label": glabel,
-                        "total": g_total_val,
-                        "units": g_units_val
-                    })
+                    groups_out.append(Group(gid, glabel, g_total_val, g_units_val))
 
         # Build section output. Include top-level 'units' if present in the source.
-        section_entry: Dict[str, Any] = {
-            "id": section_key,
-            "title": title,
-            "unit": {"name": unit.get("name", ""), "plural": unit.get("plural", "")},
-            "states": normalized_states,
-            "final_state": final_state,
-            "groups": groups_out
-        }
+        section_entry = Section(
+            id=section_key,
+            title=title,
+            unit={"name": unit.get("name", ""), "plural": unit.get("plural", "")},
+            states=normalized_states,
+            final_state=final_state,
+            groups=groups_out,
+        )
         if section_units is not None:
             # include the raw top-level units mapping if present in the YAML
-            section_entry["units"] = section_units if isinstance(section_units, dict) else {}
+            section_entry.units = section_units if isinstance(section_units, dict) else {}
 
-            if len(section_entry["units"].keys()) == 0:
+            if len(section_entry.units.keys()) == 0:
                 handle_warning(f"Section '{section_key}': top-level 'units' is empty.")
 
         sections_out.append(section_entry)
@@ -698,7 +827,7 @@ def interpret_sections(progress: Any) -> Optional[List[Dict[str, Any]]]:
 def main() -> None:
     try:
         with open("progress.yaml", encoding="utf-8") as f:
-            progress = yaml.safe_load(f)
+            progress = yaml.load(f, Loader=_YAML_LOADER)
     except FileNotFoundError:
         handle_error("progress.yaml not found in current directory.")
         progress = None
@@ -714,7 +843,7 @@ def main() -> None:
         return
 
     for section in sections:
-        section_id = section.get("id", "unknown")
+        section_id = section.id
         out_svg_path = os.path.join("progress", f"{section_id}.svg")
         render_section_svg(section, out_svg_path)
 
@@ -1,36 +1,39 @@
 import sys
 import tkinter as tk
+import numpy as np
 from PIL import Image, ImageTk
 
+# Luma and filter tables are to_bw's own, so the preview shows what to_bw writes
+from to_bw import _luma, wb_lut, contrast_lut
+
 # ==========================
-# FILTER (UNCHANGED LOGIC)
+# FILTER
 # ==========================
 
-def apply_filter(img,
-                 grayscale=True,
-                 wb_r=1.0,
-                 wb_g=1.0,
-                 wb_b=1.0,
-                 contrast=1.0):
-    img = img.convert("RGB")
+def _wb_luts(wb_r, wb_g, wb_b):
+    return [wb_lut(f) for f in (wb_r, wb_g, wb_b)]
 
-    if grayscale:
-        img = img.convert("L").convert("RGB")
 
-    r, g, b = img.split()
-    r = r.point(lambda i: min(255, int(i * wb_r)))
-    g = g.point(lambda i: min(255, int(i * wb_g)))
-    b = b.point(lambda i: min(255, int(i * wb_b)))
-    img = Image.merge("RGB", (r, g, b))
+def filter_plane(img, grayscale=True, wb_r=1.0, wb_g=1.0, wb_b=1.0):
+    """
+    The part of the filter that contrast never affects: the L plane that the
+    final table is gathered from. With grayscale it ignores white balance too.
+    """
+    if grayscale:
+        return np.asarray(img.convert("L"))
+    # One 768-entry table white-balances all three channels in a single pass
+    rgb_lut = b"".join(_wb_luts(wb_r, wb_g, wb_b))
+    return np.asarray(img.convert("RGB").point(rgb_lut).convert("L"))
 
-    gray = img.convert("L")
-    table = [
-        max(0, min(255, int(128 + (i - 128) * contrast)))
-        for i in range(256)
-    ]
-    gray = gray.point(table)
 
-    return gray.convert("RGB")
+def filter_table(grayscale=True, wb_r=1.0, wb_g=1.0, wb_b=1.0, contrast=1.0):
+    """256-entry table that turns filter_plane's output into the filtered image."""
+    table = np.frombuffer(contrast_lut(contrast), dtype=np.uint8)
+    if grayscale:
+        # R = G = B, so grayscale -> white balance -> L -> contrast depends on the gray level
+        # alone: compose the whole chain into one 256-entry table
+        return table[_luma(*(np.frombuffer(lut, dtype=np.uint8) for lut in _wb_luts(wb_r, wb_g, wb_b)))]
+    return table
 
 # ==========================
 # APP SETUP
@@ -43,6 +46,14 @@ def apply_filter(img,
 # original_image = Image.open(sys.argv[1])
 original_image = Image.open(".\\working\\png-scans\\part-1\\temp\\IMSLP935307-PMLP1467582-farbigenoten1 27 of 27.png")
 
+# Reduced-resolution copy of the same file that the unzoomed previews are made
+# from, so only zooming in decodes the image at full size. draft() lets JPEG
+# decode straight to about this size; other formats are decoded and thumbnailed.
+PREVIEW_MAX_SIZE = (2000, 1200)
+preview_base = Image.open(original_image.filename)
+preview_base.draft(preview_base.mode, PREVIEW_MAX_SIZE)
+preview_base.thumbnail(PREVIEW_MAX_SIZE)
+
 root = tk.Tk()
 root.title("Filter Tester")
 root.geometry("1000x600")
@@ -83,25 +94,52 @@ canvas.pack(fill="both", expand=True)
 # IMAGE UPDATE
 # ==========================
 
+# Canvas-sized PhotoImage that redraws paste into, and the canvas item showing
+# it; both are rebuilt only when the canvas size changes
 current_tk_image = None
+current_tk_size = None
+canvas_image_id = None
 display_rect = None
 
-def update_image(*_):
-    global current_tk_image
+# Canvas-sized copy of preview_base, rebuilt when the canvas size changes
+preview_image = None
+preview_size = None
+
+# Last filter_plane result and the inputs it was computed from
+filter_cache = {"key": None, "plane": None}
+
+# Delay before a scheduled redraw; events arriving in between are coalesced
+UPDATE_DELAY_MS = 30
+pending_update = None
+
+def get_source_image(cw, ch):
+    """Full-resolution crop when zoomed in, otherwise the cached preview."""
+    global preview_image, preview_size
 
-    img = original_image
     if crop_box:
-        img = img.crop(crop_box)
-
-    img = apply_filter(
-        img,
-        grayscale=grayscale_var.get(),
-        wb_r=wb_r.get(),
-        wb_g=wb_g.get(),
-        wb_b=wb_b.get(),
-        contrast=contrast_var.get()
-    )
+        return original_image.crop(crop_box)
 
+    if preview_size != (cw, ch):
+        preview_image = preview_base.copy()
+        preview_image.thumbnail((cw, ch))
+        preview_size = (cw, ch)
+    return preview_image
+
+def schedule_update(*_):
+    global pending_update
+
+    if pending_update is not None:
+        root.after_cancel(pending_update)
+    pending_update = root.after(UPDATE_DELAY_MS, run_scheduled_update)
+
+def run_scheduled_update():
+    global pending_update
+
+    pending_update = None
+    update_image()
+
+def update_image(*_):
+    global current_tk_image, current_tk_size, canvas_image_id
 
     canvas.update_idletasks()
     cw, ch = canvas.winfo_width(), canvas.winfo_height()
@@ -110,6 +148,19 @@ def update_image(*_):
     if cw < 2 or ch < 2:
         return
 
+    grayscale = grayscale_var.get()
+    wb = (wb_r.get(), wb_g.get(), wb_b.get())
+
+    # Reuse the filter plane unless its inputs changed; contrast-only (and, in
+    # grayscale, white-balance-only) changes then cost a single table gather
+    key = (crop_box, None if crop_box else (cw, ch), grayscale, None if grayscale else wb)
+    if filter_cache["key"] != key:
+        filter_cache["plane"] = filter_plane(get_source_image(cw, ch), grayscale, *wb)
+        filter_cache["key"] = key
+
+    table = filter_table(grayscale, *wb, contrast=contrast_var.get())
+    img = Image.fromarray(table[filter_cache["plane"]])
+
     scale = min(cw / img.width, ch / img.height)
 
     new_w = max(1, int(img.width * scale))
@@ -117,9 +168,18 @@ def update_image(*_):
 
     img = img.resize((new_w, new_h))
 
-    current_tk_image = ImageTk.PhotoImage(img)
-    canvas.delete("all")
-    canvas.create_image(cw // 2, ch // 2, image=current_tk_image, anchor="center")
+    if current_tk_size != (cw, ch):
+        current_tk_image = ImageTk.PhotoImage(Image.new("L", (cw, ch)))
+        current_tk_size = (cw, ch)
+        if canvas_image_id is not None:
+            canvas.delete(canvas_image_id)
+        canvas_image_id = canvas.create_image(cw // 2, ch // 2, image=current_tk_image, anchor="center")
+
+    # paste() fills the photo from its top-left corner, so centre the scaled
+    # image on a black canvas-sized frame first
+    frame = Image.new("L", (cw, ch))
+    frame.paste(img, ((cw - new_w) // 2, (ch - new_h) // 2))
+    current_tk_image.paste(frame)
 
 # ==========================
 # MOUSE SELECTION (ZOOM)
@@ -199,8 +259,7 @@ def slider_with_entry(parent, label, var, min_val=0.5, max_val=2.0):
         to=max_val,
         resolution=0.01,
         orient="horizontal",
-        variable=var,
-        command=lambda _: update_image()
+        variable=var
     )
     slider.pack(side="left", fill="x", expand=True)
 
@@ -212,7 +271,6 @@ def slider_with_entry(parent, label, var, min_val=0.5, max_val=2.0):
         try:
             v = float(entry.get())
             var.set(max(min_val, min(max_val, v)))
-            update_image()
         except ValueError:
             pass
 
@@ -222,6 +280,8 @@ def slider_with_entry(parent, label, var, min_val=0.5, max_val=2.0):
 
     entry.bind("<Return>", sync_from_entry)
     var.trace_add("write", sync_from_var)
+    # Slider drags and entry edits both write var; redraw once they settle
+    var.trace_add("write", schedule_update)
 
 # ==========================
 # CONTROLS
@@ -231,7 +291,7 @@ tk.Checkbutton(
     controls_frame,
     text="Grayscale",
     variable=grayscale_var,
-    command=update_image
+    command=schedule_update
 ).pack(anchor="w", pady=5)
 
 slider_with_entry(controls_frame, "White Balance – Red", wb_r)
@@ -256,7 +316,7 @@ tk.Label(
 # EVENTS
 # ==========================
 
-root.bind("<Configure>", lambda e: update_image())
+root.bind("<Configure>", schedule_update)
 
 update_image()
 root.mainloop()
@@ -1,4 +1,6 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from PIL import Image
 
 # ==========================
@@ -22,61 +24,94 @@ CONTRAST = 5.0
 # FILTER
 # ==========================
 
-def apply_filter(img,
-                 grayscale=True,
-                 wb_r=1.0,
-                 wb_g=1.0,
-                 wb_b=1.0,
-                 contrast=1.0):
-    img = img.convert("RGB")
+def _luma(r, g, b):
+    # Same fixed-point ITU-R 601-2 weights PIL uses for convert("L")
+    r, g, b = (c.astype(np.uint32) for c in (r, g, b))
+    return ((r * 19595 + g * 38470 + b * 7471 + 0x8000) >> 16).astype(np.uint8)
+
+
+def _lut(fn):
+    """256-byte table of fn over the levels 0..255, clipped to 0..255 and truncated like int()."""
+    return np.clip(fn(np.arange(256, dtype=np.float64)), 0, 255).astype(np.uint8).tobytes()
+
 
-    # Step 1: Grayscale
-    if grayscale:
-        img = img.convert("L").convert("RGB")
+def wb_lut(factor):
+    """256-byte white balance table: i -> min(255, int(i * factor))."""
+    return _lut(lambda x: x * factor)
 
-    # Step 2: White balance
-    r, g, b = img.split()
-    r = r.point(lambda i: min(255, int(i * wb_r)))
-    g = g.point(lambda i: min(255, int(i * wb_g)))
-    b = b.point(lambda i: min(255, int(i * wb_b)))
-    img = Image.merge("RGB", (r, g, b))
 
-    # Step 3: Contrast (grayscale domain)
-    gray = img.convert("L")
+def contrast_lut(contrast):
+    """256-byte contrast table around mid-gray."""
+    return _lut(lambda x: 128 + (x - 128) * contrast)
 
-    table = [
-        max(0, min(255, int(128 + (i - 128) * contrast)))
-        for i in range(256)
-    ]
 
-    gray = gray.point(table)
-    img = gray.convert("RGB")
+IDENTITY_LUT = bytes(range(256))
 
-    return img
+# Single-band modes: expanded to RGB they have R = G = B in every pixel
+GRAY_MODES = ("1", "L", "LA")
+
+# Tables for the configured filter, built once at import
+WB_LUT_R = wb_lut(WB_R)
+WB_LUT_G = wb_lut(WB_G)
+WB_LUT_B = wb_lut(WB_B)
+CONTRAST_LUT = contrast_lut(CONTRAST)
+
+
+def apply_filter(img,
+                 grayscale=True,
+                 r_lut=IDENTITY_LUT,
+                 g_lut=IDENTITY_LUT,
+                 b_lut=IDENTITY_LUT,
+                 c_lut=IDENTITY_LUT):
+    # Gray-mode input has nothing for per-channel white balance to act on
+    # separately: take the single-table path instead of expanding it to RGB
+    if grayscale or img.mode in GRAY_MODES:
+        # R = G = B, so grayscale -> white balance -> L -> contrast depends on the gray level
+        # alone: compose the whole chain into one 256-entry table and apply it in a single pass
+        wb_luts = [np.frombuffer(lut, dtype=np.uint8) for lut in (r_lut, g_lut, b_lut)]
+        fused = np.frombuffer(c_lut, dtype=np.uint8)[_luma(*wb_luts)]
+        return img.convert("L").point(fused.tobytes())
+
+    # White balance: one 768-entry table covers all three channels in a single pass
+    balanced = img.convert("RGB").point(r_lut + g_lut + b_lut)
+
+    # Contrast (grayscale domain)
+    return balanced.convert("L").point(c_lut)
 
 # ==========================
 # PROCESS DIRECTORY TREE
 # ==========================
 
-for root, _, files in os.walk(INPUT_ROOT):
-    for file in files:
-        if not file.lower().endswith(".png"):
-            continue
-
-        input_path = os.path.join(root, file)
-        rel = os.path.relpath(root, INPUT_ROOT)
-        out_dir = os.path.join(OUTPUT_ROOT, rel)
-        os.makedirs(out_dir, exist_ok=True)
-
-        with Image.open(input_path) as img:
-            result = apply_filter(
-                img,
-                grayscale=ENABLE_GRAYSCALE,
-                wb_r=WB_R,
-                wb_g=WB_G,
-                wb_b=WB_B,
-                contrast=CONTRAST
-            )
-            result.save(os.path.join(out_dir, file))
-
-print("Processing complete.")
+def _process_one(pair):
+    input_path, output_path = pair
+    with Image.open(input_path) as img:
+        result = apply_filter(
+            img,
+            grayscale=ENABLE_GRAYSCALE,
+            r_lut=WB_LUT_R,
+            g_lut=WB_LUT_G,
+            b_lut=WB_LUT_B,
+            c_lut=CONTRAST_LUT
+        )
+        # result is mode L: PNG stores it natively, a third of the data of RGB
+        result.save(output_path, optimize=False, compress_level=6)
+
+
+if __name__ == "__main__":
+    pairs = []
+    for root, _, files in os.walk(INPUT_ROOT):
+        for file in files:
+            if not file.lower().endswith(".png"):
+                continue
+
+            input_path = os.path.join(root, file)
+            rel = os.path.relpath(root, INPUT_ROOT)
+            out_dir = os.path.join(OUTPUT_ROOT, rel)
+            os.makedirs(out_dir, exist_ok=True)
+            pairs.append((input_path, os.path.join(out_dir, file)))
+
+    # Files are independent: spread them over one worker process per CPU
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+        list(ex.map(_process_one, pairs, chunksize=8))
+
+    print("Processing complete.")